@@ -1,11 +1,15 @@
 """Главный класс для взаимодействия с сервером."""
 
-from aiohttp import ClientSession
-from aiohttp.client_exceptions import ContentTypeError
-from loguru import logger
+import json
+from dataclasses import dataclass
+from pathlib import Path
 
-from mauren.enums import LeaderBoardGroups
-from mauren.exceptions import MauException, MauRequestError
+from aiohttp import ClientError, ClientSession
+
+from mauren.balancer import Balancer
+from mauren.enums import BalanceStrategy, LeaderBoardGroups
+from mauren.exceptions import MauActionError, MauException, MauRequestError
+from mauren.transport import HttpTransport, RecordTransport, Transport
 from mauren.types.context import GameContext
 from mauren.types.game import CardColor
 from mauren.types.room import Room, RoomDelete, RoomEdit
@@ -20,25 +24,127 @@ from mauren.types.user import (
 _DEFAULT_SERVER = "https://mau.miroq.ru/api/"
 
 
-class Mau:
-    """Взаимодействие с сервером."""
+@dataclass(frozen=True, slots=True)
+class GameAction:
+    """Игровое действие.
+
+    Хранит путь действия относительно `/game/`.
+    Создаётся через методы класса, например `GameAction.color(color)`.
+    """
+
+    path: str
+
+    @classmethod
+    def kick(cls, user_id: str) -> "GameAction":
+        return cls(f"kick/{user_id}")
+
+    @classmethod
+    def skip(cls) -> "GameAction":
+        return cls("skip")
+
+    @classmethod
+    def next(cls) -> "GameAction":
+        return cls("next")
+
+    @classmethod
+    def take(cls) -> "GameAction":
+        return cls("take")
+
+    @classmethod
+    def shotgun_take(cls) -> "GameAction":
+        return cls("shotgun/take")
+
+    @classmethod
+    def shotgun_shot(cls) -> "GameAction":
+        return cls("shotgun/shot")
+
+    @classmethod
+    def bluff(cls) -> "GameAction":
+        return cls("bluff")
+
+    @classmethod
+    def color(cls, color: CardColor) -> "GameAction":
+        return cls(f"color/{color.value}")
+
+    @classmethod
+    def player(cls, user_id: str) -> "GameAction":
+        return cls(f"player/{user_id}")
+
+
+def _failed_step(e: MauRequestError, total: int) -> int | None:
+    # Сервер может указать номер неудачного шага в ответе
+    try:
+        step = json.loads(e.text).get("step")
+    except (ValueError, AttributeError):
+        step = None
+    if isinstance(step, int) and 0 <= step < total:
+        return step
+    return None
 
-    def __init__(self, server: str = _DEFAULT_SERVER) -> None:
-        self.server = server
-        self.session = ClientSession(self.server)
+
+def _missing_endpoint(e: MauRequestError) -> bool:
+    if e.status_code == 405:
+        return True
+    if e.status_code != 404:
+        return False
+    if e.text.strip() == "":
+        return True
+    # FastAPI отвечает так на неизвестный путь
+    try:
+        return json.loads(e.text) == {"detail": "Not Found"}
+    except ValueError:
+        return False
+
+
+class Mau:
+    """Взаимодействие с сервером.
+
+    Можно передать несколько адресов серверов, тогда запросы будут
+    распределяться между ними, а недоступные серверы исключаться.
+    При `sticky` запросы одного пользователя идут на один сервер.
+
+    Вместо обращения к серверу можно указать свой `transport`,
+    например чтобы воспроизвести ответы сервера.
+    При указании `record` все запросы и ответы будут записаны в файл.
+    """
+
+    def __init__(
+        self,
+        server: str | list[str] = _DEFAULT_SERVER,
+        strategy: BalanceStrategy = BalanceStrategy.LEAST_REQUESTS,
+        sticky: bool = False,
+        health_interval: float = 10,
+        transport: Transport | None = None,
+        record: str | Path | None = None,
+    ) -> None:
+        servers = [server] if isinstance(server, str) else server
+        if len(servers) == 0:
+            raise MauException("At least one server is required")
+
+        self.server = servers[0]
+        self.balancer: Balancer | None = None
+        self.session: ClientSession | None = None
+        if transport is None:
+            self.balancer = Balancer(
+                servers, strategy, sticky, health_interval=health_interval
+            )
+            self.session = self.balancer.nodes[0].session
+            transport = HttpTransport(self.balancer)
+        if record is not None:
+            transport = RecordTransport(transport, record)
+        self.transport = transport
+        self._batch_supported: bool | None = None
 
     async def close(self) -> None:
-        await self.session.close()
+        await self.transport.close()
 
     async def _request(self, url: str, method: str = "get", **options):
+        r = await self.transport.request(method, url, **options)
+        if r.status != 200:
+            raise MauRequestError(r.status, r.body)
         try:
-            async with self.session.request(method, url, **options) as r:
-                logger.debug("{} {}", url, r.status)
-
-                if r.status == 200:
-                    return await r.json()
-                raise MauRequestError(r.status, await r.text())
-        except ContentTypeError as e:
+            return json.loads(r.body)
+        except json.JSONDecodeError as e:
             raise MauException(f"Failed to parse: {e}") from e
 
     # Game
@@ -82,78 +188,92 @@ class Mau:
     # Game actions
     # ============
 
-    async def game_kick(self, token: str, user_id: str) -> GameContext:
-        """Выгоняет игрока из игры."""
+    async def _game_action(self, token: str, action: GameAction) -> GameContext:
         res = await self._request(
-            f"/game/kick/{user_id}",
+            f"/game/{action.path}",
             method="post",
             headers=[("Authorization", f"Bearer {token}")],
         )
         return GameContext.validate(res)
 
+    async def game_kick(self, token: str, user_id: str) -> GameContext:
+        """Выгоняет игрока из игры."""
+        return await self._game_action(token, GameAction.kick(user_id))
+
     async def game_skip(self, token: str) -> GameContext:
         """Пропускает текущего игрока в игре."""
-        res = await self._request(
-            "/game/skip", method="post", headers=[("Authorization", f"Bearer {token}")]
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.skip())
 
     async def game_next(self, token: str) -> GameContext:
         """Передаёт ход следующему игроку."""
-        res = await self._request(
-            "/game/next", method="post", headers=[("Authorization", f"Bearer {token}")]
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.next())
 
     async def game_take(self, token: str) -> GameContext:
         """Берёт карты."""
-        res = await self._request(
-            "/game/tale", method="post", headers=[("Authorization", f"Bearer {token}")]
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.take())
 
     async def game_shotgun_take(self, token: str) -> GameContext:
         """Берёт карты вместо выстрела из револьвера."""
-        res = await self._request(
-            "/game/shotgun/take",
-            method="post",
-            headers=[("Authorization", f"Bearer {token}")],
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.shotgun_take())
 
     async def game_shotgun_shot(self, token: str) -> GameContext:
         """Выстреливает из револьвера вместо взятия карт."""
-        res = await self._request(
-            "/game/shotgun/shot",
-            method="post",
-            headers=[("Authorization", f"Bearer {token}")],
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.shotgun_shot())
 
     async def game_bluff(self, token: str) -> GameContext:
         """Проверяет прошлого игрока на честность."""
-        res = await self._request(
-            "/game/bluff", method="post", headers=[("Authorization", f"Bearer {token}")]
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.bluff())
 
     async def game_color(self, token: str, color: CardColor) -> GameContext:
         """Выбирает цвет для карты."""
-        res = await self._request(
-            f"/game/color/{color.value}",
-            method="post",
-            headers=[("Authorization", f"Bearer {token}")],
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.color(color))
 
     async def game_player(self, token: str, user_id: str) -> GameContext:
         """Выбирает игрока для обмена картами."""
-        res = await self._request(
-            f"/game/player/{user_id}",
-            method="post",
-            headers=[("Authorization", f"Bearer {token}")],
-        )
-        return GameContext.validate(res)
+        return await self._game_action(token, GameAction.player(user_id))
+
+    async def game_actions(self, token: str, actions: list[GameAction]) -> GameContext:
+        """Выполняет несколько игровых действий подряд.
+
+        Если сервер поддерживает пакетные запросы, все действия
+        отправляются одним запросом.
+        Иначе они выполняются по очереди, а проверяется только
+        итоговый контекст.
+        Все запросы пакета уходят на один сервер.
+        """
+        if len(actions) == 0:
+            raise MauException("No actions to send")
+
+        headers = [("Authorization", f"Bearer {token}")]
+        with self.transport.pin(f"Bearer {token}"):
+            if self._batch_supported is not False:
+                try:
+                    res = await self._request(
+                        "/game/batch",
+                        method="post",
+                        headers=headers,
+                        json={"actions": [a.path for a in actions]},
+                    )
+                    self._batch_supported = True
+                    return GameContext.validate(res)
+                except MauRequestError as e:
+                    if not _missing_endpoint(e):
+                        step = _failed_step(e, len(actions))
+                        failed = None if step is None else actions[step].path
+                        raise MauActionError(step, failed, e) from e
+                    self._batch_supported = False
+                except (MauException, ClientError, TimeoutError) as e:
+                    raise MauActionError(None, None, e) from e
+
+            res = None
+            for i, action in enumerate(actions):
+                try:
+                    res = await self._request(
+                        f"/game/{action.path}", method="post", headers=headers
+                    )
+                except (MauException, ClientError, TimeoutError) as e:
+                    raise MauActionError(i, action.path, e) from e
+            return GameContext.validate(res)
 
     # Get rooms
     # =========
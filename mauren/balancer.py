@@ -0,0 +1,162 @@
+"""Распределение запросов между несколькими серверами Mau."""
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import blake2b
+from time import monotonic
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+from loguru import logger
+
+from mauren.enums import BalanceStrategy
+from mauren.exceptions import MauException
+
+# Вес нового замера задержки при скользящем среднем
+_LATENCY_WEIGHT = 0.2
+
+# Сервер, закреплённый за текущей задачей
+_pinned: ContextVar["MauNode | None"] = ContextVar("mauren_pinned", default=None)
+
+
+class MauNode:
+    """Отдельный сервер Mau.
+
+    Хранит собственную сессию и статистику запросов,
+    по которой балансировщик выбирает сервер.
+    """
+
+    def __init__(self, server: str) -> None:
+        self.server = server
+        self.session = ClientSession(self.server)
+        self.active = 0
+        self.latency = 0.0
+        self.failures = 0
+        self.healthy = True
+
+    def acquire(self) -> float:
+        """Отмечает начало запроса к серверу."""
+        self.active += 1
+        return monotonic()
+
+    def release(self) -> None:
+        """Отмечает завершение запроса к серверу."""
+        self.active -= 1
+
+    def record(self, start: float) -> None:
+        """Учитывает время успешного ответа сервера."""
+        elapsed = monotonic() - start
+        if self.latency == 0:
+            self.latency = elapsed
+        else:
+            self.latency += (elapsed - self.latency) * _LATENCY_WEIGHT
+        self.failures = 0
+        self.healthy = True
+
+    def fail(self, max_failures: int) -> None:
+        """Отмечает ошибку соединения или ошибку на стороне сервера."""
+        self.failures += 1
+        if self.healthy and self.failures >= max_failures:
+            logger.warning("Node {} ejected", self.server)
+            self.healthy = False
+
+
+def _token_weight(token: str, node: MauNode) -> int:
+    digest = blake2b(f"{node.server}\0{token}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest)
+
+
+class Balancer:
+    """Выбирает сервер для очередного запроса.
+
+    Периодически проверяет доступность серверов в фоне и исключает
+    из выборки те, что перестали отвечать.
+    При `sticky` запросы с одним токеном всегда идут на один сервер.
+    Сервер для токена выбирается хешированием, поэтому соответствие
+    не нужно хранить, а при выпадении сервера переезжают только
+    привязанные к нему токены.
+    """
+
+    def __init__(
+        self,
+        servers: list[str],
+        strategy: BalanceStrategy = BalanceStrategy.LEAST_REQUESTS,
+        sticky: bool = False,
+        health_path: str = "/rooms/random",
+        health_interval: float = 10,
+        max_failures: int = 3,
+    ) -> None:
+        if len(servers) == 0:
+            raise MauException("At least one server is required")
+
+        self.nodes = [MauNode(s) for s in servers]
+        self.strategy = strategy
+        self.sticky = sticky
+        self.health_path = health_path
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self._health_task: asyncio.Task[None] | None = None
+
+    def _key(self, node: MauNode) -> tuple[float, ...]:
+        if self.strategy == BalanceStrategy.LATENCY:
+            return ((node.active + 1) * node.latency, node.active)
+        return (node.active, node.latency)
+
+    def choose(self, token: str | None = None) -> MauNode:
+        """Возвращает сервер для следующего запроса."""
+        if len(self.nodes) > 1:
+            self._start_health_check()
+
+        pinned = _pinned.get()
+        if pinned is not None and pinned in self.nodes:
+            return pinned
+
+        nodes = [n for n in self.nodes if n.healthy] or self.nodes
+        if self.sticky and token is not None:
+            return max(nodes, key=lambda n: _token_weight(token, n))
+        return min(nodes, key=self._key)
+
+    @contextmanager
+    def pin(self, token: str | None = None) -> Iterator[MauNode]:
+        """Направляет все запросы текущей задачи на один сервер."""
+        node = self.choose(token)
+        reset = _pinned.set(node)
+        try:
+            yield node
+        finally:
+            _pinned.reset(reset)
+
+    def _start_health_check(self) -> None:
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _check(self, node: MauNode) -> None:
+        try:
+            start = monotonic()
+            async with node.session.get(
+                self.health_path, timeout=ClientTimeout(total=self.health_interval)
+            ) as r:
+                if r.status < 500:
+                    if not node.healthy:
+                        logger.info("Node {} is back", node.server)
+                    # Замер при проверке не даёт задержке устареть,
+                    # даже если запросы на сервер давно не отправлялись
+                    node.record(start)
+                    return
+        except (ClientError, TimeoutError):
+            pass
+        node.fail(self.max_failures)
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.gather(*(self._check(n) for n in self.nodes))
+            await asyncio.sleep(self.health_interval)
+
+    async def close(self) -> None:
+        """Останавливает проверки и закрывает все сессии."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for node in self.nodes:
+            await node.session.close()
@@ -44,3 +44,10 @@ class CardBehavior(StrEnum):
     REVERSE = "reverse"
     WILD_COLOR = "wild+color"
     WOLD_TAKE = "wild+take"
+
+
+class BalanceStrategy(StrEnum):
+    """Способ выбора сервера для запроса."""
+
+    LEAST_REQUESTS = "least_requests"
+    LATENCY = "latency"
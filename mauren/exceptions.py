@@ -12,3 +12,17 @@ class MauRequestError(MauException):
         super().__init__(f"Server returned {status_code} status")
         self.status_code = status_code
         self.text = text
+
+
+class MauActionError(MauException):
+    """Ошибка при выполнении одного из действий пакета.
+
+    Если сервер не сообщил, на каком шаге произошла ошибка,
+    `step` и `action` будут None.
+    """
+
+    def __init__(self, step: int | None, action: str | None, error: Exception) -> None:
+        super().__init__(f"Action {step} ({action}) failed: {error}")
+        self.step = step
+        self.action = action
+        self.error = error
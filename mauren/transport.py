@@ -0,0 +1,225 @@
+"""Способы доставки запросов до сервера.
+
+Позволяют записать реальные ответы сервера в файл и позже
+воспроизвести их без подключения к сети.
+"""
+
+import asyncio
+import gzip
+import json
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict, dataclass
+from hashlib import blake2b
+from pathlib import Path
+from time import monotonic
+from typing import IO, Any
+
+from aiohttp import ClientConnectionError
+from loguru import logger
+
+from mauren.balancer import Balancer
+from mauren.exceptions import MauException
+
+
+@dataclass(slots=True)
+class Response:
+    """Ответ сервера на запрос."""
+
+    method: str
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: str
+    elapsed: float
+
+
+def _request_key(options: dict[str, Any]) -> str:
+    # Отличает запросы разных пользователей к одному адресу,
+    # не сохраняя в файл токены и пароли
+    auth = dict(options.get("headers", ())).get("Authorization", "")
+    body = json.dumps(options.get("json"), sort_keys=True, separators=(",", ":"))
+    return blake2b(f"{auth}\0{body}".encode(), digest_size=8).hexdigest()
+
+
+def _open(path: Path, write: bool = False) -> IO[str]:
+    if path.suffix == ".gz":
+        if write:
+            return gzip.open(path, "wt", encoding="utf-8")
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("w" if write else "r", encoding="utf-8")
+
+
+class Transport(ABC):
+    """Базовый способ отправки запросов."""
+
+    @abstractmethod
+    async def request(self, method: str, url: str, **options: Any) -> Response:
+        """Отправляет запрос и возвращает ответ сервера."""
+
+    def pin(self, token: str | None = None) -> AbstractContextManager[object]:
+        """Выполняет несколько запросов через одно соединение."""
+        return nullcontext()
+
+    async def close(self) -> None:
+        """Освобождает занятые ресурсы."""
+
+
+class HttpTransport(Transport):
+    """Отправляет запросы на серверы Mau."""
+
+    def __init__(self, balancer: Balancer) -> None:
+        self.balancer = balancer
+
+    async def request(self, method: str, url: str, **options: Any) -> Response:
+        auth = dict(options.get("headers", ())).get("Authorization")
+        node = self.balancer.choose(auth)
+        start = node.acquire()
+        try:
+            async with node.session.request(method, url, **options) as r:
+                logger.debug("{} {} {}", node.server, url, r.status)
+                if r.status < 500:
+                    node.record(start)
+                else:
+                    node.fail(self.balancer.max_failures)
+                return Response(
+                    method,
+                    url,
+                    r.status,
+                    dict(r.headers),
+                    await r.text(),
+                    monotonic() - start,
+                )
+        except (ClientConnectionError, TimeoutError):
+            node.fail(self.balancer.max_failures)
+            raise
+        finally:
+            node.release()
+
+    def pin(self, token: str | None = None) -> AbstractContextManager[object]:
+        return self.balancer.pin(token)
+
+    async def close(self) -> None:
+        await self.balancer.close()
+
+
+class RecordTransport(Transport):
+    """Записывает все запросы и ответы в файл.
+
+    Каждый ответ сохраняется отдельной JSON строкой по мере получения.
+    Вместе с ответом записывается порядковый номер запроса и хеш его
+    авторизации и тела, чтобы при воспроизведении сопоставить
+    одновременные запросы.
+    Файл сбрасывается на диск каждые `flush_every` строк или
+    `flush_interval` секунд, поэтому запись переживает падение.
+    Если имя файла оканчивается на `.gz`, он будет сжат.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        path: str | Path,
+        flush_every: int = 100,
+        flush_interval: float = 1,
+    ) -> None:
+        self.transport = transport
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._file = _open(Path(path), write=True)
+        self._seq = 0
+        self._unflushed = 0
+        self._flushed_at = monotonic()
+
+    async def request(self, method: str, url: str, **options: Any) -> Response:
+        seq = self._seq
+        self._seq += 1
+        key = _request_key(options)
+        res = await self.transport.request(method, url, **options)
+        line = {"seq": seq, "key": key, **asdict(res)}
+        self._file.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")))
+        self._file.write("\n")
+
+        self._unflushed += 1
+        if (
+            self._unflushed >= self.flush_every
+            or monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self._file.flush()
+            self._unflushed = 0
+            self._flushed_at = monotonic()
+        return res
+
+    def pin(self, token: str | None = None) -> AbstractContextManager[object]:
+        return self.transport.pin(token)
+
+    async def close(self) -> None:
+        self._file.close()
+        await self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Воспроизводит ранее записанные ответы сервера.
+
+    Ответы читаются из файла по мере необходимости, поэтому файл
+    не загружается в память целиком.
+    Запрос получает самый ранний записанный ответ с тем же методом,
+    адресом, авторизацией и телом среди ближайших `lookahead` строк.
+    Оборванный конец файла, например после падения во время записи,
+    считается концом записи.
+    При `timing` сохраняется исходное время ответа сервера.
+    """
+
+    def __init__(
+        self, path: str | Path, timing: bool = False, lookahead: int = 64
+    ) -> None:
+        self.timing = timing
+        self.lookahead = lookahead
+        self._file = _open(Path(path))
+        self._buffer: list[tuple[int, str, Response]] = []
+        self._ended = False
+
+    def _read(self) -> bool:
+        if self._ended:
+            return False
+        try:
+            line = self._file.readline()
+            data = None if line == "" else json.loads(line)
+        except (EOFError, ValueError):
+            logger.warning("Replay file is truncated")
+            data = None
+        if data is None:
+            self._ended = True
+            return False
+
+        seq = data.pop("seq")
+        key = data.pop("key")
+        self._buffer.append((seq, key, Response(**data)))
+        return True
+
+    def _take(self, method: str, url: str, key: str) -> Response | None:
+        found = [
+            i
+            for i, (_, k, r) in enumerate(self._buffer)
+            if r.method == method and r.url == url and k == key
+        ]
+        if len(found) == 0:
+            return None
+        i = min(found, key=lambda i: self._buffer[i][0])
+        return self._buffer.pop(i)[2]
+
+    async def request(self, method: str, url: str, **options: Any) -> Response:
+        key = _request_key(options)
+        res = self._take(method, url, key)
+        while res is None and len(self._buffer) < self.lookahead:
+            if not self._read():
+                break
+            res = self._take(method, url, key)
+
+        if res is None:
+            raise MauException(f"No recorded response for {method} {url}")
+        if self.timing:
+            await asyncio.sleep(res.elapsed)
+        return res
+
+    async def close(self) -> None:
+        self._file.close()
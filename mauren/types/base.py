@@ -4,4 +4,4 @@ from pydantic import BaseModel, ConfigDict
 class MauObject(BaseModel):
     """базовый класс для всех объектов API."""
 
-    config = ConfigDict(frozen=True)
+    model_config = ConfigDict(frozen=True)
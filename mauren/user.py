@@ -1,6 +1,6 @@
 """Пользователь Mau."""
 
-from mauren.api import Mau
+from mauren.api import GameAction, Mau
 from mauren.exceptions import MauException
 from mauren.types.context import GameContext
 from mauren.types.game import CardColor
@@ -8,6 +8,68 @@ from mauren.types.room import Room, RoomDelete, RoomEdit
 from mauren.types.user import User, UserChangePassword, UserCredentials, UserEdit
 
 
+class GameActions:
+    """Очередь игровых действий.
+
+    Собирает несколько действий, чтобы выполнить их за один раз.
+    Возвращает итоговый игровой контекст после последнего действия.
+    """
+
+    def __init__(self, user: "MauUser") -> None:
+        self.user = user
+        self.actions: list[GameAction] = []
+
+    def kick(self, user_id: str) -> "GameActions":
+        """Выгоняет игрока из игры."""
+        self.actions.append(GameAction.kick(user_id))
+        return self
+
+    def skip(self) -> "GameActions":
+        """Пропускает текущего игрока в игре."""
+        self.actions.append(GameAction.skip())
+        return self
+
+    def next(self) -> "GameActions":
+        """Передаёт ход следующему игроку."""
+        self.actions.append(GameAction.next())
+        return self
+
+    def take(self) -> "GameActions":
+        """Берёт карты."""
+        self.actions.append(GameAction.take())
+        return self
+
+    def shotgun_take(self) -> "GameActions":
+        """Берёт карты вместо выстрела из револьвера."""
+        self.actions.append(GameAction.shotgun_take())
+        return self
+
+    def shotgun_shot(self) -> "GameActions":
+        """Выстреливает из револьвера вместо взятия карт."""
+        self.actions.append(GameAction.shotgun_shot())
+        return self
+
+    def bluff(self) -> "GameActions":
+        """Проверяет прошлого игрока на честность."""
+        self.actions.append(GameAction.bluff())
+        return self
+
+    def color(self, color: CardColor) -> "GameActions":
+        """Выбирает цвет для карты."""
+        self.actions.append(GameAction.color(color))
+        return self
+
+    def player(self, user_id: str) -> "GameActions":
+        """Выбирает игрока для обмена картами."""
+        self.actions.append(GameAction.player(user_id))
+        return self
+
+    async def send(self) -> GameContext:
+        """Выполняет все действия из очереди."""
+        actions, self.actions = self.actions, []
+        return await self.user.client.game_actions(self.user._get_token(), actions)
+
+
 class MauUser:
     """Пользователь Mau.
 
@@ -84,6 +146,15 @@ class MauUser:
         """Выбирает игрока для обмена картами."""
         return await self.client.game_player(self._get_token(), user_id)
 
+    def actions(self) -> GameActions:
+        """Создаёт очередь игровых действий.
+
+        ```py
+        ctx = await user.actions().color(CardColor.RED).next().send()
+        ```
+        """
+        return GameActions(self)
+
     # Room
     # ====
 
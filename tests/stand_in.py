@@ -0,0 +1,19 @@
+"""Временные серверы Mau для тестов."""
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+class StandIn:
+    """Временный сервер Mau.
+
+    Наследники добавляют свои обработчики в `self.app.router`.
+    """
+
+    def __init__(self) -> None:
+        self.app = web.Application()
+        self.server = TestServer(self.app)
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("/"))
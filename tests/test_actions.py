@@ -0,0 +1,131 @@
+"""Проверка пакетного выполнения игровых действий."""
+
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import ClientConnectionError, web
+from stand_in import StandIn
+
+from mauren.api import GameAction, Mau
+from mauren.enums import CardColor
+from mauren.exceptions import MauActionError, MauException
+
+_PLAYER = {"user_id": "u1", "name": "u1", "shotgun_current": 0}
+_CONTEXT = {
+    "game": {
+        "id": "g1",
+        "create_time": "2025-01-01T00:00:00",
+        "end_time": "2025-01-01T00:00:00",
+        "owner": {**_PLAYER, "hand": 0},
+        "winners": [],
+        "losers": [],
+    },
+    "player": {**_PLAYER, "hand": []},
+}
+
+
+class GameStandIn(StandIn):
+    """Сервер Mau с игровыми действиями."""
+
+    def __init__(self, batch: bool = False) -> None:
+        super().__init__()
+        self.paths: list[str] = []
+        self.fail: str | None = None
+        self.batch_error: web.Response | None = None
+        if batch:
+            self.app.router.add_post("/game/batch", self.game_batch)
+        self.app.router.add_post("/game/{action:(?!batch).+}", self.game_action)
+        self.app.router.add_route("*", "/{tail:.*}", self.not_found)
+
+    async def game_action(self, request: web.Request) -> web.Response:
+        self.paths.append(request.path)
+        if request.path == self.fail:
+            return web.json_response({"detail": "Not your turn"}, status=400)
+        return web.json_response(_CONTEXT)
+
+    async def game_batch(self, request: web.Request) -> web.Response:
+        self.paths.append(request.path)
+        if self.batch_error is not None:
+            return self.batch_error
+        return web.json_response(_CONTEXT)
+
+    async def not_found(self, request: web.Request) -> web.Response:
+        return web.json_response({"detail": "Not Found"}, status=404)
+
+
+class GameActionsTest(IsolatedAsyncioTestCase):
+    actions = [GameAction.color(CardColor.RED), GameAction.next()]
+
+    async def start(self, *stand_ins: GameStandIn) -> Mau:
+        for s in stand_ins:
+            await s.server.start_server()
+            self.addAsyncCleanup(s.server.close)
+        mau = Mau([s.url for s in stand_ins], health_interval=60)
+        self.addAsyncCleanup(mau.close)
+        return mau
+
+    async def test_empty(self) -> None:
+        mau = await self.start(GameStandIn())
+        with self.assertRaises(MauException):
+            await mau.game_actions("token", [])
+
+    async def test_batch(self) -> None:
+        stand_in = GameStandIn(batch=True)
+        mau = await self.start(stand_in)
+        await mau.game_actions("token", self.actions)
+        self.assertEqual(stand_in.paths, ["/game/batch"])
+
+    async def test_fallback(self) -> None:
+        stand_in = GameStandIn()
+        mau = await self.start(stand_in)
+        await mau.game_actions("token", self.actions)
+        await mau.game_actions("token", self.actions)
+        self.assertEqual(stand_in.paths, ["/game/color/0", "/game/next"] * 2)
+
+    async def test_fallback_step(self) -> None:
+        stand_in = GameStandIn()
+        stand_in.fail = "/game/next"
+        mau = await self.start(stand_in)
+        with self.assertRaises(MauActionError) as e:
+            await mau.game_actions("token", self.actions)
+        self.assertEqual(e.exception.step, 1)
+        self.assertEqual(e.exception.action, "next")
+
+    async def test_batch_step(self) -> None:
+        stand_in = GameStandIn(batch=True)
+        stand_in.batch_error = web.json_response({"step": 1}, status=400)
+        mau = await self.start(stand_in)
+        with self.assertRaises(MauActionError) as e:
+            await mau.game_actions("token", self.actions)
+        self.assertEqual(e.exception.step, 1)
+
+    async def test_batch_not_found(self) -> None:
+        stand_in = GameStandIn(batch=True)
+        stand_in.batch_error = web.json_response(
+            {"detail": "No active game"}, status=404
+        )
+        mau = await self.start(stand_in)
+        with self.assertRaises(MauActionError) as e:
+            await mau.game_actions("token", self.actions)
+        self.assertIsNone(e.exception.step)
+
+        stand_in.batch_error = None
+        await mau.game_actions("token", self.actions)
+        self.assertEqual(stand_in.paths, ["/game/batch"] * 2)
+
+    async def test_single_node(self) -> None:
+        stand_ins = [GameStandIn(), GameStandIn(), GameStandIn()]
+        mau = await self.start(*stand_ins)
+        actions = [GameAction.take(), *self.actions]
+        for _ in range(3):
+            await mau.game_actions("token", actions)
+        for s in stand_ins:
+            self.assertEqual(len(s.paths) % len(actions), 0)
+
+    async def test_batch_connection_error(self) -> None:
+        stand_in = GameStandIn(batch=True)
+        mau = await self.start(stand_in)
+        await stand_in.server.close()
+        with self.assertRaises(MauActionError) as e:
+            await mau.game_actions("token", self.actions)
+        self.assertIsNone(e.exception.step)
+        self.assertIsInstance(e.exception.error, ClientConnectionError)
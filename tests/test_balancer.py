@@ -0,0 +1,156 @@
+"""Проверка распределения запросов между серверами."""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import ClientConnectionError, web
+from stand_in import StandIn
+
+from mauren.api import Mau
+from mauren.balancer import Balancer
+from mauren.enums import BalanceStrategy
+from mauren.exceptions import MauException, MauRequestError
+
+
+class RoomsStandIn(StandIn):
+    """Сервер Mau, считающий полученные запросы."""
+
+    def __init__(self, delay: float = 0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.status = 200
+        self.hits = 0
+        self.app.router.add_get("/rooms", self.rooms)
+        self.app.router.add_get("/rooms/random", self.random_room)
+
+    async def rooms(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.Response(status=self.status)
+        return web.json_response([])
+
+    async def random_room(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.delay)
+        return web.Response(status=404 if self.status == 200 else self.status)
+
+
+class BalancerTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.stand_ins = [RoomsStandIn(), RoomsStandIn()]
+        for s in self.stand_ins:
+            await s.server.start_server()
+
+    async def asyncTearDown(self) -> None:
+        for s in self.stand_ins:
+            await s.server.close()
+
+    async def test_empty_servers(self) -> None:
+        with self.assertRaises(MauException):
+            Balancer([])
+
+    async def test_least_requests(self) -> None:
+        for s in self.stand_ins:
+            s.delay = 0.1
+        mau = Mau([s.url for s in self.stand_ins], health_interval=60)
+        await asyncio.gather(*(mau.rooms() for _ in range(4)))
+        await mau.close()
+        self.assertEqual([s.hits for s in self.stand_ins], [2, 2])
+
+    async def test_eject_after_failures(self) -> None:
+        live, dead = self.stand_ins
+        dead_url = dead.url
+        await dead.server.close()
+        mau = Mau([dead_url, live.url], health_interval=60)
+        dead_node = mau.balancer.nodes[0]
+
+        for _ in range(mau.balancer.max_failures):
+            try:
+                await mau.rooms()
+            except ClientConnectionError:
+                pass
+        self.assertFalse(dead_node.healthy)
+
+        hits = live.hits
+        await mau.rooms()
+        await mau.rooms()
+        await mau.close()
+        self.assertEqual(live.hits, hits + 2)
+
+    async def test_eject_server_errors(self) -> None:
+        live, broken = self.stand_ins
+        # Ошибки приходят быстрее ответов, поэтому сервер кажется лучшим
+        live.delay = 0.01
+        broken.status = 503
+        mau = Mau([broken.url, live.url], health_interval=0.05)
+        assert mau.balancer is not None
+        broken_node = mau.balancer.nodes[0]
+
+        failed = 0
+        for _ in range(50):
+            try:
+                await mau.rooms()
+            except MauRequestError:
+                failed += 1
+        await mau.close()
+
+        self.assertFalse(broken_node.healthy)
+        self.assertLessEqual(failed, mau.balancer.max_failures)
+        self.assertEqual(live.hits, 50 - failed)
+
+    async def test_latency_probe(self) -> None:
+        balancer = Balancer(
+            [s.url for s in self.stand_ins],
+            BalanceStrategy.LATENCY,
+            health_interval=60,
+        )
+        slow, fast = balancer.nodes
+        # Один медленный ответ, например при холодном старте
+        slow.latency = 10
+        fast.latency = 0.5
+
+        for _ in range(20):
+            await balancer._check(slow)
+        self.assertIs(balancer.choose(), slow)
+        await balancer.close()
+
+    async def test_recovery(self) -> None:
+        balancer = Balancer([self.stand_ins[0].url])
+        node = balancer.nodes[0]
+        for _ in range(balancer.max_failures):
+            node.fail(balancer.max_failures)
+        self.assertFalse(node.healthy)
+
+        await balancer._check(node)
+        await balancer.close()
+        self.assertTrue(node.healthy)
+        self.assertEqual(node.failures, 0)
+
+    async def test_health_check_timeout(self) -> None:
+        self.stand_ins[0].delay = 1
+        balancer = Balancer([self.stand_ins[0].url], health_interval=0.05)
+        node = balancer.nodes[0]
+        await balancer._check(node)
+        await balancer.close()
+        self.assertEqual(node.failures, 1)
+
+    async def test_sticky(self) -> None:
+        balancer = Balancer(
+            [s.url for s in self.stand_ins] + ["http://127.0.0.1:1/"],
+            sticky=True,
+            health_interval=60,
+        )
+        tokens = [f"Bearer {i}" for i in range(32)]
+        before = {t: balancer.choose(t) for t in tokens}
+        self.assertEqual(before, {t: balancer.choose(t) for t in tokens})
+
+        ejected = before[tokens[0]]
+        ejected.healthy = False
+        after = {t: balancer.choose(t) for t in tokens}
+        await balancer.close()
+
+        for t in tokens:
+            if before[t] is ejected:
+                self.assertIsNot(after[t], ejected)
+            else:
+                self.assertIs(after[t], before[t])
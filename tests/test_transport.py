@@ -0,0 +1,148 @@
+"""Проверка записи и воспроизведения ответов сервера."""
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import web
+from stand_in import StandIn
+
+from mauren.api import Mau
+from mauren.exceptions import MauException
+from mauren.transport import RecordTransport, ReplayTransport, Response, Transport
+
+
+def _user(username: str) -> dict[str, Any]:
+    return {
+        "username": username,
+        "name": username,
+        "avatar_url": "",
+        "gems": 0,
+        "create_date": "2025-01-01T00:00:00",
+        "play_count": 0,
+        "win_count": 0,
+        "cards_count": 0,
+    }
+
+
+class UsersStandIn(StandIn):
+    """Сервер Mau с комнатами и пользователями."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.app.router.add_get("/rooms", self.rooms)
+        self.app.router.add_get("/users", self.users)
+        self.app.router.add_get("/users/me", self.user_me)
+
+    async def rooms(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(0.1)
+        return web.json_response([])
+
+    async def users(self, request: web.Request) -> web.Response:
+        return web.json_response([_user("u1")])
+
+    async def user_me(self, request: web.Request) -> web.Response:
+        username = request.headers["Authorization"].removeprefix("Bearer ")
+        # Первый пользователь получает ответ последним
+        if username == "u1":
+            await asyncio.sleep(0.1)
+        return web.json_response(_user(username))
+
+
+class TransportTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.stand_in = UsersStandIn()
+        await self.stand_in.server.start_server()
+        self.addAsyncCleanup(self.stand_in.server.close)
+
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    async def record(self, path: Path) -> None:
+        mau = Mau(self.stand_in.url, record=path)
+        self.assertIsNotNone(mau.balancer)
+        await asyncio.gather(mau.rooms(), mau.users())
+        await mau.close()
+
+    async def test_replay_concurrent(self) -> None:
+        for name in ("capture.jsonl", "capture.jsonl.gz"):
+            path = self.dir / name
+            await self.record(path)
+
+            mau = Mau(transport=ReplayTransport(path))
+            rooms, users = await asyncio.gather(mau.rooms(), mau.users())
+            await mau.close()
+            self.assertEqual(rooms, [])
+            self.assertEqual(users[0].username, "u1")
+
+    async def test_replay_tokens(self) -> None:
+        path = self.dir / "capture.jsonl"
+        mau = Mau(self.stand_in.url, record=path)
+        await asyncio.gather(mau.user_me("u1"), mau.user_me("u2"))
+        await mau.close()
+        self.assertNotIn("Bearer", path.read_text())
+
+        mau = Mau(transport=ReplayTransport(path))
+        u1, u2 = await asyncio.gather(mau.user_me("u1"), mau.user_me("u2"))
+        await mau.close()
+        self.assertEqual((u1.username, u2.username), ("u1", "u2"))
+
+    async def test_replay_timing(self) -> None:
+        path = self.dir / "capture.jsonl"
+        await self.record(path)
+
+        mau = Mau(transport=ReplayTransport(path, timing=True))
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await mau.rooms()
+        await mau.close()
+        self.assertGreaterEqual(loop.time() - start, 0.1)
+
+    async def test_replay_missing(self) -> None:
+        path = self.dir / "capture.jsonl"
+        await self.record(path)
+
+        mau = Mau(transport=ReplayTransport(path))
+        await mau.rooms()
+        with self.assertRaises(MauException):
+            await mau.rooms()
+        await mau.close()
+
+    async def test_flush_and_truncated(self) -> None:
+        path = self.dir / "capture.jsonl.gz"
+        mau = Mau(self.stand_in.url)
+        mau.transport = RecordTransport(mau.transport, path, flush_every=1)
+        for _ in range(3):
+            await mau.users()
+
+        # Запись не закрыта, как при падении процесса,
+        # поэтому в сжатом файле нет завершающего блока
+        truncated = self.dir / "truncated.jsonl.gz"
+        truncated.write_bytes(path.read_bytes())
+        await mau.close()
+
+        replay = Mau(transport=ReplayTransport(truncated))
+        for _ in range(3):
+            await replay.users()
+        with self.assertRaises(MauException):
+            await replay.users()
+        await replay.close()
+
+    async def test_abstract(self) -> None:
+        class Partial(Transport):
+            pass
+
+        class Full(Transport):
+            async def request(self, method: str, url: str, **options: Any) -> Response:
+                return Response(method, url, 200, {}, "[]", 0)
+
+        with self.assertRaises(TypeError):
+            Partial()  # type: ignore[abstract]
+        self.assertEqual(await Mau(transport=Full()).rooms(), [])
+
+    async def test_empty_servers(self) -> None:
+        with self.assertRaises(MauException):
+            Mau([])